@@ -9,6 +9,7 @@ import argparse
 import asyncio
 import json
 import logging
+import math
 import random
 import re
 import signal
@@ -16,24 +17,51 @@ import sys
 import threading
 import time
 import uuid
-from collections import defaultdict
+from array import array
+from bisect import bisect_right
+from collections import defaultdict, deque
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from statistics import mean, median
+from itertools import accumulate
+from types import MappingProxyType
 from urllib.parse import urlparse
 
 import requests
 from requests.adapters import HTTPAdapter
 
-try:
-    import aiohttp
-except ImportError:
-    aiohttp = None
+# Optional async-engine dependencies, imported on first use by _load_async_engine().
+aiohttp = None
+uvloop = None
 
 logger = logging.getLogger("slayer")
 
 SENSITIVE_KEY_HINTS = ("token", "secret", "password", "key", "authorization")
 SPARK_CHARS = "▁▂▃▄▅▆▇█"
+# Queued-but-unsent work allowed per worker before further scheduled requests are dropped.
+MAX_BACKLOG_PER_WORKER = 20
+# Scheduling loop period in seconds; each tick hands out that slice of the second's requests.
+TICK_INTERVAL = 0.1
+# Live-report samples kept for the trend sparklines (one per 10s report, i.e. the last 10 minutes).
+TREND_POINTS = 60
+
+
+def _load_async_engine():
+    """Import aiohttp (and uvloop, if installed) on first use; returns whether aiohttp is available.
+
+    Deferred so the default threads engine doesn't pay for importing them at startup.
+    """
+    global aiohttp, uvloop
+    if aiohttp is None:
+        try:
+            import aiohttp as aiohttp_module
+        except ImportError:
+            return False
+        try:
+            import uvloop as uvloop_module
+        except ImportError:
+            uvloop_module = None
+        aiohttp, uvloop = aiohttp_module, uvloop_module
+    return True
 
 
 class Colors:
@@ -59,6 +87,8 @@ class Colors:
 class ProgressBar:
     """Display a text-based progress bar."""
 
+    __slots__ = ('total_seconds', 'width')
+
     def __init__(self, total_seconds, width=50):
         self.total_seconds = max(total_seconds, 1)
         self.width = width
@@ -74,64 +104,149 @@ class ProgressBar:
 class Statistics:
     """Collect and analyze load test statistics."""
 
+    # Slotted: flush() updates these counters once per recorded request.
+    __slots__ = (
+        'total_requests', 'successful_requests', 'failed_requests', 'cancelled_requests',
+        'status_codes', 'response_times', 'latency_sum', 'errors', 'per_target', 'start_time', 'end_time',
+        '_start_mono', '_end_mono', 'lock', '_pending', '_rps_second', '_rps_cur', '_rps_prev',
+    )
+
     def __init__(self):
         self.total_requests = 0
         self.successful_requests = 0
         self.failed_requests = 0
         self.cancelled_requests = 0
         self.status_codes = defaultdict(int)
-        self.response_times = []
+        # Unboxed doubles: 8 bytes per sample instead of a pointer plus a float object.
+        self.response_times = array('d')
+        self.latency_sum = 0.0
         self.errors = defaultdict(int)
-        self.per_target = defaultdict(lambda: {'total': 0, 'successful': 0, 'failed': 0})
+        # label -> [successful, failed]; expanded to a dict only in get_statistics().
+        self.per_target = defaultdict(lambda: [0, 0])
+        # Wall-clock bounds for the exported timestamps; durations use the monotonic pair.
         self.start_time = None
         self.end_time = None
+        self._start_mono = None
+        self._end_mono = None
         self.lock = threading.Lock()
+        self._pending = deque()
+        # Two-bucket rolling counter (this second + the previous one) for current RPS.
+        self._rps_second = 0
+        self._rps_cur = 0
+        self._rps_prev = 0
+
+    def mark_start(self):
+        self.start_time = time.time()
+        self._start_mono = time.monotonic()
+
+    def mark_end(self):
+        if self.start_time is None:
+            self.mark_start()
+        self.end_time = time.time()
+        self._end_mono = time.monotonic()
+
+    def elapsed(self):
+        """Measured test duration in seconds, immune to wall-clock adjustments mid-run."""
+        return max(self._end_mono - self._start_mono, 1e-6)
 
     def record_request(self, status_code, response_time, error=None, validation_failed=False, label=None):
-        """Record a single request result."""
+        """Queue a single request result; folded into the counters by flush()."""
+        # deque.append is atomic, so workers never contend on the lock here.
+        self._pending.append((status_code, response_time, error, validation_failed, label))
+
+    def flush(self):
+        """Fold queued results into the counters. Called from the scheduling loop, not by workers."""
+        pending = self._pending
+        if not pending:
+            return
+        second = int(time.monotonic())
         with self.lock:
-            self.total_requests += 1
-            self.response_times.append(response_time)
-            self.status_codes[status_code] += 1
+            if second != self._rps_second:
+                self._rps_prev = self._rps_cur if second == self._rps_second + 1 else 0
+                self._rps_cur = 0
+                self._rps_second = second
 
-            successful = 200 <= status_code < 300
-            if successful:
-                self.successful_requests += 1
-            else:
-                self.failed_requests += 1
+            while pending:
+                try:
+                    status_code, response_time, error, validation_failed, label = pending.popleft()
+                except IndexError:
+                    break
+                self._rps_cur += 1
+
+                self.total_requests += 1
+                self.response_times.append(response_time)
+                self.latency_sum += response_time
+                self.status_codes[status_code] += 1
+
+                successful = 200 <= status_code < 300
+                if successful:
+                    self.successful_requests += 1
+                else:
+                    self.failed_requests += 1
 
-            if label:
-                target = self.per_target[label]
-                target['total'] += 1
-                target['successful' if successful else 'failed'] += 1
+                if label:
+                    self.per_target[label][0 if successful else 1] += 1
 
-            if validation_failed:
-                self.errors['validation_failed'] += 1
-            elif error:
-                self.errors[error] += 1
+                if validation_failed:
+                    self.errors['validation_failed'] += 1
+                elif error:
+                    self.errors[error] += 1
 
-    def get_statistics(self):
-        """Return current statistics summary."""
+    def current_rps(self):
+        """Completed requests over the last second, interpolated across the two buckets."""
+        now = time.monotonic()
+        second = int(now)
+        with self.lock:
+            if second == self._rps_second:
+                cur, prev = self._rps_cur, self._rps_prev
+            elif second == self._rps_second + 1:
+                cur, prev = 0, self._rps_cur
+            else:
+                return 0.0
+        return cur + prev * (1 - (now - second))
+
+    def get_statistics(self, snapshot=True):
+        """Return current statistics summary.
+
+        With snapshot=False the status-code and error maps are read-only views over
+        the live counters instead of copies: cheap for a report printed on the spot,
+        but not something to hold on to or serialize.
+        """
+        self.flush()
         if not self.response_times:
             return None
 
+        # One sort serves min/max/median/percentiles; statistics.median() would sort again.
         latencies = sorted(self.response_times)
         n = len(latencies)
+        mid = n // 2
+        median_latency = latencies[mid] if n % 2 else (latencies[mid - 1] + latencies[mid]) / 2
+
+        if snapshot:
+            status_codes = dict(self.status_codes)
+            errors = dict(self.errors)
+        else:
+            status_codes = MappingProxyType(self.status_codes)
+            errors = MappingProxyType(self.errors)
+        per_target = {
+            label: {'total': ok + failed, 'successful': ok, 'failed': failed}
+            for label, (ok, failed) in self.per_target.items()
+        }
 
         return {
             'total': self.total_requests,
             'successful': self.successful_requests,
             'failed': self.failed_requests,
             'error_rate': (self.failed_requests / self.total_requests * 100) if self.total_requests > 0 else 0,
-            'min_latency': min(latencies),
-            'max_latency': max(latencies),
-            'avg_latency': mean(latencies),
-            'median_latency': median(latencies),
+            'min_latency': latencies[0],
+            'max_latency': latencies[-1],
+            'avg_latency': self.latency_sum / n,
+            'median_latency': median_latency,
             'p95_latency': latencies[min(n - 1, int(n * 0.95))],
             'p99_latency': latencies[min(n - 1, int(n * 0.99))],
-            'status_codes': dict(self.status_codes),
-            'errors': dict(self.errors),
-            'per_target': {k: dict(v) for k, v in self.per_target.items()},
+            'status_codes': status_codes,
+            'errors': errors,
+            'per_target': per_target,
         }
 
 
@@ -201,6 +316,11 @@ def describe_targets(config):
 
 
 _STEP_FIELDS = ('url', 'method', 'headers', 'json_body', 'raw_body', 'validation_type', 'validation_keyword', 'extract')
+# Step fields that may carry {{...}} placeholders and are rendered per request.
+_RENDERED_FIELDS = ('url', 'headers', 'json_body', 'raw_body', 'validation_keyword')
+# Per-step validation modes, resolved once from the configured validation_type strings.
+VALIDATE_NONE, VALIDATE_STATUS, VALIDATE_CONTENT = 0, 1, 2
+_VALIDATION_MODES = {'Check status code': VALIDATE_STATUS, 'Validate response content': VALIDATE_CONTENT}
 
 
 def normalize_flow_entry(entry):
@@ -214,6 +334,8 @@ def normalize_flow_entry(entry):
 class _AtomicCounter:
     """Thread-safe incrementing counter, shared by the {{counter}} template token."""
 
+    __slots__ = ('_value', '_lock')
+
     def __init__(self):
         self._value = 0
         self._lock = threading.Lock()
@@ -229,7 +351,11 @@ _TEMPLATE_RE = re.compile(r'\{\{(\w+)(?::(-?\d+):(-?\d+))?\}\}')
 
 
 def render_template(value, variables):
-    """Substitute {{name}} placeholders: flow-extracted variables first, then built-in generators."""
+    """Substitute {{name}} placeholders: flow-extracted variables first, then built-in generators.
+
+    Containers are copied only along the paths where something was substituted; untouched
+    values (and wholly static dicts/lists) are returned as the same objects.
+    """
     if isinstance(value, str):
         def replace(match):
             name, min_s, max_s = match.group(1), match.group(2), match.group(3)
@@ -248,12 +374,37 @@ def render_template(value, variables):
             return match.group(0)
         return _TEMPLATE_RE.sub(replace, value)
     if isinstance(value, dict):
-        return {k: render_template(v, variables) for k, v in value.items()}
+        rendered = value
+        for k, v in value.items():
+            new = render_template(v, variables)
+            if new is not v:
+                if rendered is value:
+                    rendered = dict(value)
+                rendered[k] = new
+        return rendered
     if isinstance(value, list):
-        return [render_template(v, variables) for v in value]
+        rendered = value
+        for i, v in enumerate(value):
+            new = render_template(v, variables)
+            if new is not v:
+                if rendered is value:
+                    rendered = list(value)
+                rendered[i] = new
+        return rendered
     return value
 
 
+def has_template(value):
+    """Whether a value (or anything nested inside it) contains a {{...}} placeholder."""
+    if isinstance(value, str):
+        return _TEMPLATE_RE.search(value) is not None
+    if isinstance(value, dict):
+        return any(has_template(v) for v in value.values())
+    if isinstance(value, list):
+        return any(has_template(v) for v in value)
+    return False
+
+
 _PATH_TOKEN_RE = re.compile(r'[^.\[\]]+|\[\d+\]')
 
 
@@ -272,6 +423,26 @@ def extract_json_path(data, path):
     return current
 
 
+def _constant_rps(config, current_second):
+    return config['target_rps']
+
+
+def _ramp_up_rps(config, current_second):
+    start_rps = config.get('start_rps', 10)
+    rps_increase = (config['target_rps'] - start_rps) / config['duration']
+    return start_rps + (rps_increase * current_second)
+
+
+def _spike_rps(config, current_second):
+    if current_second < config.get('spike_duration', 10):
+        return config['target_rps'] * 2
+    return config['target_rps']
+
+
+# Traffic pattern name -> per-second RPS function. Unknown patterns run at a constant rate.
+RPS_PATTERNS = {'Constant': _constant_rps, 'Ramp-up': _ramp_up_rps, 'Spike': _spike_rps}
+
+
 class LoadTester:
     """Main load testing engine."""
 
@@ -281,12 +452,16 @@ class LoadTester:
         self.running = False
         self.session = None
         self.executor = None
+        self._backlog_slots = None
+        # Per-test request kwargs that don't depend on the step (timeout/TLS/auth), built by the engine.
+        self._request_options = {}
         self.submitted = 0
         self._scenario_targets = None
+        self._single_flow = None
         self._scenario_cum_weights = None
         self._scenario_total_weight = 0
-        self._latency_history = []
-        self._rps_history = []
+        self._latency_history = deque(maxlen=TREND_POINTS)
+        self._rps_history = deque(maxlen=TREND_POINTS)
 
     # ------------------------------------------------------------------
     # Display helpers
@@ -354,12 +529,12 @@ class LoadTester:
         self.config['method'] = method
 
         engine_options = ["Threads (default)"]
-        if aiohttp is not None:
+        if _load_async_engine():
             engine_options.append("Async / aiohttp (higher RPS ceiling)")
         else:
             engine_options.append("Async / aiohttp (not installed - pip install aiohttp)")
         engine_choice = self.prompt("Select execution engine", default=engine_options[0], options=engine_options)
-        if engine_choice.startswith("Async") and aiohttp is None:
+        if engine_choice.startswith("Async") and not _load_async_engine():
             print(f"{Colors.RED}aiohttp is not installed; falling back to the threads engine.{Colors.RESET}")
             self.config['engine'] = 'threads'
         else:
@@ -551,26 +726,34 @@ class LoadTester:
 
     def calculate_rps_for_second(self, current_second):
         """Calculate RPS for current second based on traffic pattern."""
-        pattern = self.config.get('pattern', 'Constant')
-        target_rps = self.config['target_rps']
-        duration = self.config['duration']
+        rps_func = RPS_PATTERNS.get(self.config.get('pattern', 'Constant'), _constant_rps)
+        return rps_func(self.config, current_second)
 
-        if pattern == "Constant":
-            return target_rps
+    def _backlog_cap(self, concurrency):
+        """Units of work allowed queued or running before scheduled requests are dropped.
 
-        elif pattern == "Ramp-up":
-            start_rps = self.config.get('start_rps', 10)
-            rps_increase = (target_rps - start_rps) / duration
-            return start_rps + (rps_increase * current_second)
+        The thread engine takes a semaphore slot per unit until it finishes; the async engine's
+        queue only counts units no worker has picked up, so it is sized `concurrency` smaller.
 
-        elif pattern == "Spike":
-            spike_duration = self.config.get('spike_duration', 10)
-            if current_second < spike_duration:
-                return target_rps * 2
-            else:
-                return target_rps
+        One tick's worth of the peak rate sits on top of the per-worker allowance, so a tick's
+        own batch always fits and only backlog carried over from earlier ticks causes drops.
+        (Warm-up runs at the second-0 rate, which the peak already covers.)
+        """
+        # default=0: a non-positive duration (accepted from --duration/--config) schedules nothing.
+        peak_rps = max(
+            (self.calculate_rps_for_second(second) for second in range(self.config['duration'])), default=0
+        )
+        return concurrency * MAX_BACKLOG_PER_WORKER + math.ceil(peak_rps / round(1 / TICK_INTERVAL))
 
-        return target_rps
+    @staticmethod
+    def _build_rps_schedule(duration, rps_func):
+        """Evaluate the traffic pattern once per second of a phase, up front.
+
+        Returns the per-second RPS list and, for each second, how many requests are
+        due before it starts.
+        """
+        rps_schedule = [rps_func(second) for second in range(duration)]
+        return rps_schedule, list(accumulate(rps_schedule, initial=0))
 
     @staticmethod
     def _content_matches(body_text, keyword):
@@ -578,39 +761,12 @@ class LoadTester:
             return True
         return keyword.lower() in (body_text or '').lower()
 
-    def validate_response(self, response, validation_type=None, validation_keyword=None):
-        """Validate a `requests` response based on configuration (or per-target overrides)."""
-        if not self.config.get('validation_enabled', False):
-            return True
-
-        validation_type = validation_type or self.config.get('validation_type')
-
-        if validation_type == "Check status code":
-            return 200 <= response.status_code < 300
-
-        elif validation_type == "Validate response content":
-            keyword = validation_keyword if validation_keyword is not None else self.config.get('validation_keyword', '')
-            try:
-                return self._content_matches(response.text, keyword)
-            except (UnicodeDecodeError, ValueError):
-                return False
-
-        return True
-
-    def validate_async_response(self, status_code, body_text, validation_type=None, validation_keyword=None):
-        """Validate an aiohttp response (status_code + already-read body text)."""
-        if not self.config.get('validation_enabled', False):
-            return True
-
-        validation_type = validation_type or self.config.get('validation_type')
-
-        if validation_type == "Check status code":
+    def validate_result(self, mode, status_code, body_text, keyword):
+        """Validate a response (status code + body text, if it was read) against a step's mode."""
+        if mode == VALIDATE_STATUS:
             return 200 <= status_code < 300
-
-        elif validation_type == "Validate response content":
-            keyword = validation_keyword if validation_keyword is not None else self.config.get('validation_keyword', '')
+        if mode == VALIDATE_CONTENT:
             return self._content_matches(body_text, keyword)
-
         return True
 
     def _build_session(self, pool_size):
@@ -625,11 +781,44 @@ class LoadTester:
         session.mount('https://', adapter)
         return session
 
+    def _compile_step(self, step):
+        """Resolve a step's config defaults once and note which fields need template rendering."""
+        cfg = self.config
+        compiled = {
+            'url': step['url'],
+            'method': str(step.get('method', cfg['method'])).upper(),
+            'headers': {**(cfg.get('headers') or {}), **(step.get('headers') or {})},
+            'json_body': step.get('json_body'),
+            'raw_body': step.get('raw_body'),
+            'validation_keyword': step.get('validation_keyword'),
+            'extract': step.get('extract'),
+        }
+        if compiled['validation_keyword'] is None:
+            compiled['validation_keyword'] = cfg.get('validation_keyword', '')
+        if cfg.get('validation_enabled', False):
+            validation_type = step.get('validation_type') or cfg.get('validation_type')
+            compiled['validation'] = _VALIDATION_MODES.get(validation_type, VALIDATE_NONE)
+        else:
+            compiled['validation'] = VALIDATE_NONE
+        compiled['needs_body'] = bool(compiled['extract']) or compiled['validation'] == VALIDATE_CONTENT
+        json_body = compiled['json_body']
+        if json_body is not None and not has_template(json_body):
+            # A static JSON body is serialized once here instead of by the HTTP client on every
+            # request; it then travels as a pre-encoded raw body with the same Content-Type.
+            compiled['raw_body'] = json.dumps(json_body).encode('utf-8')
+            compiled['json_body'] = None
+            if not any(k.lower() == 'content-type' for k in compiled['headers']):
+                compiled['headers']['Content-Type'] = 'application/json'
+        compiled['dynamic'] = tuple(name for name in _RENDERED_FIELDS if has_template(compiled[name]))
+        return compiled
+
     def _prepare_scenario(self):
-        """Precompute weighted-selection data for multi-endpoint / multi-step scenarios."""
+        """Compile the flows to run, plus weighted-selection data for multi-endpoint scenarios."""
         scenario = self.config.get('scenario')
         if not scenario:
             self._scenario_targets = None
+            step = {k: self.config[k] for k in ('url', 'json_body', 'raw_body') if k in self.config}
+            self._single_flow = (None, [self._compile_step(step)])
             return
 
         normalized = [normalize_flow_entry(entry) for entry in scenario]
@@ -638,6 +827,8 @@ class LoadTester:
         if total_weight <= 0:
             raise ValueError("Scenario weights must sum to a positive number")
 
+        for entry in normalized:
+            entry['steps'] = [self._compile_step(step) for step in entry['steps']]
         self._scenario_targets = normalized
         self._scenario_total_weight = total_weight
         cumulative = []
@@ -649,28 +840,16 @@ class LoadTester:
 
     def _pick_scenario_target(self):
         """Pick one scenario flow using weighted random selection."""
-        r = random.uniform(0, self._scenario_total_weight)
-        for entry, cum in zip(self._scenario_targets, self._scenario_cum_weights):
-            if r <= cum:
-                return entry
-        return self._scenario_targets[-1]
+        r = random.random() * self._scenario_total_weight
+        index = bisect_right(self._scenario_cum_weights, r)
+        return self._scenario_targets[min(index, len(self._scenario_targets) - 1)]
 
     def _get_flow(self):
         """Return (flow_name_or_None, steps) — the unit of work for one submission."""
         if self._scenario_targets:
             target = self._pick_scenario_target()
             return target.get('name'), target['steps']
-        cfg = self.config
-        step = {
-            'url': cfg['url'],
-            'method': cfg['method'],
-            'headers': cfg.get('headers'),
-            'json_body': cfg.get('json_body'),
-            'raw_body': cfg.get('raw_body'),
-            'validation_type': cfg.get('validation_type'),
-            'validation_keyword': cfg.get('validation_keyword'),
-        }
-        return None, [step]
+        return self._single_flow
 
     @staticmethod
     def _step_label(flow_name, index, n_steps, method, url):
@@ -696,16 +875,13 @@ class LoadTester:
             return False
 
     def _render_step_fields(self, step, variables):
-        """Render templates for one step's fields against the flow's accumulated variables."""
-        headers = render_template({**(self.config.get('headers') or {}), **(step.get('headers') or {})}, variables)
-        url = render_template(step['url'], variables)
-        method = str(step.get('method', self.config['method'])).upper()
-        json_body = render_template(step['json_body'], variables) if step.get('json_body') is not None else None
-        raw_body = render_template(step['raw_body'], variables) if step.get('raw_body') is not None else None
-        validation_type = step.get('validation_type', self.config.get('validation_type'))
-        keyword_raw = step.get('validation_keyword', self.config.get('validation_keyword'))
-        validation_keyword = render_template(keyword_raw, variables) if keyword_raw else keyword_raw
-        return url, method, headers, json_body, raw_body, validation_type, validation_keyword
+        """Render a compiled step's templated fields against the flow's accumulated variables."""
+        if step['dynamic']:
+            step = {**step, **{name: render_template(step[name], variables) for name in step['dynamic']}}
+        return (
+            step['url'], step['method'], step['headers'], step['json_body'], step['raw_body'],
+            step['validation_keyword'],
+        )
 
     def _send_request(self, record=True):
         """Execute one unit of work: a single request, or a multi-step flow, in sequence."""
@@ -717,38 +893,42 @@ class LoadTester:
             if not keep_going:
                 break
 
+    def _send_request_slot(self, record):
+        """Thread-pool entry point: run one unit of work, then free its backlog slot."""
+        try:
+            self._send_request(record)
+        finally:
+            self._backlog_slots.release()
+
     def _send_step_sync(self, step, variables, cookies, index, flow_name, n_steps, record):
         """Perform one flow step over `requests` and, if record=True, log the outcome.
 
         Returns whether the flow should continue to its next step.
         """
-        url, method, headers, json_body, raw_body, validation_type, validation_keyword = (
-            self._render_step_fields(step, variables)
-        )
+        url, method, headers, json_body, raw_body, validation_keyword = self._render_step_fields(step, variables)
         label = self._step_label(flow_name, index, n_steps, method, url)
-        start_time = time.monotonic()
+        start_time = time.perf_counter()
         try:
-            kwargs = {
-                'headers': headers or None,
-                'timeout': self.config['timeout'],
-                'verify': self.config.get('verify_ssl', True),
-                'cookies': cookies or None,
-            }
-            if self.config.get('basic_auth'):
-                kwargs['auth'] = tuple(self.config['basic_auth'])
+            kwargs = dict(self._request_options, headers=headers or None, cookies=cookies or None)
             if json_body is not None:
                 kwargs['json'] = json_body
             elif raw_body is not None:
                 kwargs['data'] = raw_body
 
             response = self.session.request(method, url, **kwargs)
-            response_time = (time.monotonic() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             # Only this response's own cookies are read (never the shared session jar), so
             # concurrent flow executions never contaminate each other's cookie state.
-            cookies.update(response.cookies.get_dict())
-
-            extract_ok = self._apply_extract(step.get('extract'), response.text, variables, label)
-            validation_ok = self.validate_response(response, validation_type, validation_keyword)
+            if response.cookies:
+                cookies.update(response.cookies.get_dict())
+
+            # Decoding .text can mean charset detection over the whole body, so only do it
+            # when an extract or content check will actually look at it.
+            body_text = response.text if step['needs_body'] else None
+            extract_ok = self._apply_extract(step['extract'], body_text, variables, label)
+            validation_ok = self.validate_result(
+                step['validation'], response.status_code, body_text, validation_keyword
+            )
 
             if record:
                 self.statistics.record_request(
@@ -759,20 +939,20 @@ class LoadTester:
         except requests.exceptions.Timeout:
             if record:
                 self.statistics.record_request(
-                    0, (time.monotonic() - start_time) * 1000, error="timeout", label=label
+                    0, (time.perf_counter() - start_time) * 1000, error="timeout", label=label
                 )
             return False
         except requests.exceptions.ConnectionError:
             if record:
                 self.statistics.record_request(
-                    0, (time.monotonic() - start_time) * 1000, error="connection_error", label=label
+                    0, (time.perf_counter() - start_time) * 1000, error="connection_error", label=label
                 )
             return False
         except requests.exceptions.RequestException as e:
             logger.debug("Request error: %s", e)
             if record:
                 self.statistics.record_request(
-                    0, (time.monotonic() - start_time) * 1000, error=type(e).__name__, label=label
+                    0, (time.perf_counter() - start_time) * 1000, error=type(e).__name__, label=label
                 )
             return False
 
@@ -827,11 +1007,11 @@ class LoadTester:
 
     def print_report(self, elapsed_seconds):
         """Print current test report."""
-        stats = self.statistics.get_statistics()
+        stats = self.statistics.get_statistics(snapshot=False)
         if not stats:
             return
 
-        current_rps = stats['total'] / max(elapsed_seconds, 1)
+        current_rps = self.statistics.current_rps()
         self._latency_history.append(stats['avg_latency'])
         self._rps_history.append(current_rps)
 
@@ -863,33 +1043,45 @@ class LoadTester:
 
     def _run_phase_threads(self, duration, rps_func, record, report):
         """Run one traffic phase (warm-up or measured) for `duration` seconds, thread engine."""
-        tick_interval = 0.1
+        tick_interval = TICK_INTERVAL
         ticks_per_second = round(1 / tick_interval)
         total_ticks = duration * ticks_per_second
-        scheduled = 0.0
         submitted = 0
         backlog_warned = False
         concurrency = self.config['threads']
+        rps_schedule, due_before = self._build_rps_schedule(duration, rps_func)
+        # Bound once per phase; the submit loop below can run thousands of times a second.
+        acquire_slot = self._backlog_slots.acquire
+        submit = self.executor.submit
+        send = self._send_request_slot
         start_mono = time.monotonic()
 
         for tick in range(total_ticks):
             if not self.running:
                 break
 
-            current_second = tick // ticks_per_second
-            rps = rps_func(current_second)
-            scheduled += rps * tick_interval
-            to_submit = int(scheduled) - submitted
+            current_second, tick_in_second = divmod(tick, ticks_per_second)
+            # Derived from the tick index instead of summed tick by tick, so float error
+            # can't accumulate and quietly drop requests from the schedule.
+            rps = rps_schedule[current_second]
+            scheduled = due_before[current_second] + rps * (tick_in_second + 1) / ticks_per_second
+            to_submit = int(scheduled + 1e-9) - submitted
 
             for _ in range(to_submit):
-                self.executor.submit(self._send_request, record)
+                # Slots run out only when earlier ticks' work is still outstanding (see
+                # _backlog_cap); such a request could only be sent late, so it is dropped
+                # instead. It still counts as scheduled and shows up as cancelled.
+                if not acquire_slot(blocking=False):
+                    break
+                submit(send, record)
             submitted += to_submit
             if record:
                 self.submitted += to_submit
 
             if record:
+                self.statistics.flush()
                 pending = self.submitted - self.statistics.total_requests
-                if pending > concurrency * 20 and not backlog_warned:
+                if pending > concurrency * MAX_BACKLOG_PER_WORKER and not backlog_warned:
                     print(
                         f"\n{Colors.YELLOW}Warning: request backlog is growing "
                         f"(target RPS may exceed what {concurrency} threads can sustain).{Colors.RESET}"
@@ -918,13 +1110,11 @@ class LoadTester:
 
     async def _send_step_async(self, session, step, variables, cookies, index, flow_name, n_steps, record):
         """Perform one flow step over aiohttp. Returns whether the flow should continue."""
-        url, method, headers, json_body, raw_body, validation_type, validation_keyword = (
-            self._render_step_fields(step, variables)
-        )
+        url, method, headers, json_body, raw_body, validation_keyword = self._render_step_fields(step, variables)
         label = self._step_label(flow_name, index, n_steps, method, url)
-        start_time = time.monotonic()
+        start_time = time.perf_counter()
         try:
-            kwargs = {'ssl': self.config.get('verify_ssl', True)}
+            kwargs = dict(self._request_options)
             if headers:
                 kwargs['headers'] = headers
             if cookies:
@@ -933,27 +1123,25 @@ class LoadTester:
                 kwargs['json'] = json_body
             elif raw_body is not None:
                 kwargs['data'] = raw_body
-            if self.config.get('basic_auth'):
-                user, password = self.config['basic_auth']
-                kwargs['auth'] = aiohttp.BasicAuth(user, password)
 
             async with session.request(method, url, **kwargs) as response:
-                extract_map = step.get('extract')
-                wants_content_check = (
-                    validation_type or self.config.get('validation_type')
-                ) == "Validate response content"
-                needs_body = bool(extract_map) or (self.config.get('validation_enabled', False) and wants_content_check)
-                body_text = await response.text() if needs_body else None
+                extract_map = step['extract']
+                if step['needs_body']:
+                    body_text = await response.text()
+                else:
+                    # Drain without buffering: aiohttp closes a connection whose body was left
+                    # unread, and latency should cover the full response as in the threads engine.
+                    body_text = None
+                    async for _ in response.content.iter_chunked(65536):
+                        pass
 
                 for key, morsel in response.cookies.items():
                     cookies[key] = morsel.value
 
-                response_time = (time.monotonic() - start_time) * 1000
+                response_time = (time.perf_counter() - start_time) * 1000
 
                 extract_ok = self._apply_extract(extract_map, body_text, variables, label) if extract_map else True
-                validation_ok = self.validate_async_response(
-                    response.status, body_text, validation_type, validation_keyword
-                )
+                validation_ok = self.validate_result(step['validation'], response.status, body_text, validation_keyword)
 
                 if record:
                     self.statistics.record_request(
@@ -964,59 +1152,73 @@ class LoadTester:
         except asyncio.TimeoutError:
             if record:
                 self.statistics.record_request(
-                    0, (time.monotonic() - start_time) * 1000, error="timeout", label=label
+                    0, (time.perf_counter() - start_time) * 1000, error="timeout", label=label
                 )
             return False
         except aiohttp.ClientConnectionError:
             if record:
                 self.statistics.record_request(
-                    0, (time.monotonic() - start_time) * 1000, error="connection_error", label=label
+                    0, (time.perf_counter() - start_time) * 1000, error="connection_error", label=label
                 )
             return False
         except aiohttp.ClientError as e:
             logger.debug("Async request error: %s", e)
             if record:
                 self.statistics.record_request(
-                    0, (time.monotonic() - start_time) * 1000, error=type(e).__name__, label=label
+                    0, (time.perf_counter() - start_time) * 1000, error=type(e).__name__, label=label
                 )
             return False
 
-    async def _run_phase_async(self, duration, rps_func, record, report, session, semaphore):
-        """Run one traffic phase for `duration` seconds using the async engine."""
-        tick_interval = 0.1
+    async def _async_worker(self, session, queue):
+        """Long-lived worker: pull a record flag off the queue and send one unit of work for it."""
+        while True:
+            record = await queue.get()
+            try:
+                await self._send_request_async(session, record)
+            except Exception:
+                logger.exception("Unexpected error in async worker")
+            finally:
+                queue.task_done()
+
+    async def _run_phase_async(self, duration, rps_func, record, report, queue):
+        """Run one traffic phase for `duration` seconds, feeding the async worker pool."""
+        tick_interval = TICK_INTERVAL
         ticks_per_second = round(1 / tick_interval)
         total_ticks = duration * ticks_per_second
-        scheduled = 0.0
         submitted = 0
         backlog_warned = False
         concurrency = self.config['threads']
+        rps_schedule, due_before = self._build_rps_schedule(duration, rps_func)
+        enqueue = queue.put_nowait
         start_mono = time.monotonic()
-        pending_tasks = set()
-
-        async def bounded_send():
-            async with semaphore:
-                await self._send_request_async(session, record)
 
         for tick in range(total_ticks):
             if not self.running:
                 break
 
-            current_second = tick // ticks_per_second
-            rps = rps_func(current_second)
-            scheduled += rps * tick_interval
-            to_submit = int(scheduled) - submitted
+            current_second, tick_in_second = divmod(tick, ticks_per_second)
+            # Derived from the tick index instead of summed tick by tick, so float error
+            # can't accumulate and quietly drop requests from the schedule.
+            rps = rps_schedule[current_second]
+            scheduled = due_before[current_second] + rps * (tick_in_second + 1) / ticks_per_second
+            to_submit = int(scheduled + 1e-9) - submitted
 
             for _ in range(to_submit):
-                task = asyncio.ensure_future(bounded_send())
-                pending_tasks.add(task)
-                task.add_done_callback(pending_tasks.discard)
+                # Drop rather than block the tick loop. With every worker busy the queue holds
+                # the cap minus the in-flight requests, so it fills only when earlier ticks'
+                # work is still outstanding.
+                try:
+                    enqueue(record)
+                except asyncio.QueueFull:
+                    break
             submitted += to_submit
             if record:
                 self.submitted += to_submit
 
             if record:
+                self.statistics.flush()
                 pending = self.submitted - self.statistics.total_requests
-                if pending > concurrency * 20 and not backlog_warned:
+                if pending > concurrency * MAX_BACKLOG_PER_WORKER and not backlog_warned:
                     print(
                         f"\n{Colors.YELLOW}Warning: request backlog is growing "
                         f"(target RPS may exceed what {concurrency} concurrent requests can sustain).{Colors.RESET}"
@@ -1031,21 +1233,32 @@ class LoadTester:
             if sleep_for > 0:
                 await asyncio.sleep(sleep_for)
 
-        return pending_tasks
-
     async def _run_async(self):
         """Drive warm-up + measured phases for the whole test using aiohttp."""
         concurrency = self.config['threads']
-        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=max(concurrency, 10))
+        # Targets don't move mid-test; aiohttp's default 10s DNS TTL would re-resolve every host
+        # several times a minute for nothing. None caches for the connector's (i.e. the test's) lifetime.
+        connector = aiohttp.TCPConnector(
+            limit=concurrency, limit_per_host=max(concurrency, 10), ttl_dns_cache=None
+        )
         timeout = aiohttp.ClientTimeout(total=self.config['timeout'])
-        semaphore = asyncio.Semaphore(concurrency)
-        pending = set()
+        self._request_options = {'ssl': self.config.get('verify_ssl', True)}
+        if self.config.get('basic_auth'):
+            user, password = self.config['basic_auth']
+            self._request_options['auth'] = aiohttp.BasicAuth(user, password)
+        # A fixed pool of `concurrency` workers caps in-flight requests; the phase loop only
+        # enqueues work, so no Task is created per request. The queue holds only items no worker
+        # has taken yet, so it is `concurrency` short of the cap to bound queued + running work
+        # exactly like the thread engine's semaphore.
+        queue = asyncio.Queue(maxsize=self._backlog_cap(concurrency) - concurrency)
+        workers = []
 
         # Cookies are tracked per flow execution in _send_step_async instead, so concurrent
         # "virtual users" never see each other's session state through a shared jar.
         async with aiohttp.ClientSession(
             connector=connector, timeout=timeout, cookie_jar=aiohttp.DummyCookieJar()
         ) as session:
+            workers = [asyncio.ensure_future(self._async_worker(session, queue)) for _ in range(concurrency)]
             try:
                 warmup_duration = self.config.get('warmup', 0)
                 if warmup_duration > 0:
@@ -1055,28 +1268,21 @@ class LoadTester:
                         self.config.get('start_rps', self.config['target_rps'])
                         if pattern == 'Ramp-up' else self.config['target_rps']
                     )
-                    warm_pending = await self._run_phase_async(
-                        warmup_duration, lambda _s: base_rps, False, False, session, semaphore
-                    )
-                    if warm_pending:
-                        await asyncio.gather(*warm_pending, return_exceptions=True)
+                    await self._run_phase_async(warmup_duration, lambda _s: base_rps, False, False, queue)
+                    await queue.join()
                     self.print_separator()
 
-                self.statistics.start_time = time.time()
-                pending = await self._run_phase_async(
-                    self.config['duration'], self.calculate_rps_for_second, True, True, session, semaphore
+                self.statistics.mark_start()
+                await self._run_phase_async(
+                    self.config['duration'], self.calculate_rps_for_second, True, True, queue
                 )
 
             finally:
                 self.running = False
-                if self.statistics.start_time is None:
-                    self.statistics.start_time = time.time()
-                self.statistics.end_time = time.time()
-                for task in pending:
-                    if not task.done():
-                        task.cancel()
-                if pending:
-                    await asyncio.gather(*pending, return_exceptions=True)
+                self.statistics.mark_end()
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
 
     def execute_test(self):
         """Execute the load test using the configured engine (threads or async)."""
@@ -1090,8 +1296,8 @@ class LoadTester:
         self._prepare_scenario()
         self.running = True
         self.submitted = 0
-        self._latency_history = []
-        self._rps_history = []
+        self._latency_history = deque(maxlen=TREND_POINTS)
+        self._rps_history = deque(maxlen=TREND_POINTS)
 
         try:
             signal.signal(signal.SIGTERM, self._handle_sigterm)
@@ -1108,6 +1314,10 @@ class LoadTester:
         num_threads = self.config['threads']
         self.session = self._build_session(num_threads)
         self.executor = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="slayer-worker")
+        self._backlog_slots = threading.BoundedSemaphore(self._backlog_cap(num_threads))
+        self._request_options = {'timeout': self.config['timeout'], 'verify': self.config.get('verify_ssl', True)}
+        if self.config.get('basic_auth'):
+            self._request_options['auth'] = tuple(self.config['basic_auth'])
 
         try:
             warmup_duration = self.config.get('warmup', 0)
@@ -1121,7 +1331,7 @@ class LoadTester:
                 self._run_phase_threads(warmup_duration, lambda _s: base_rps, record=False, report=False)
                 self.print_separator()
 
-            self.statistics.start_time = time.time()
+            self.statistics.mark_start()
             self._run_phase_threads(
                 self.config['duration'], self.calculate_rps_for_second, record=True, report=True
             )
@@ -1131,33 +1341,31 @@ class LoadTester:
 
         finally:
             self.running = False
-            if self.statistics.start_time is None:
-                self.statistics.start_time = time.time()
-            self.statistics.end_time = time.time()
+            self.statistics.mark_end()
             self.executor.shutdown(wait=True, cancel_futures=True)
             self.session.close()
 
     def _execute_async(self):
         """Run the test using the aiohttp-based async engine (higher RPS ceiling)."""
-        if aiohttp is None:
+        if not _load_async_engine():
             print(
                 f"{Colors.RED}The async engine requires the 'aiohttp' package. "
                 f"Install it with: pip install aiohttp{Colors.RESET}"
             )
             self.running = False
-            self.statistics.start_time = self.statistics.start_time or time.time()
-            self.statistics.end_time = time.time()
+            self.statistics.mark_end()
             return
 
+        # uvloop, when installed, is a drop-in event loop with cheaper socket I/O per request.
+        # uvloop.run() only exists from 0.18 on; older installs fall back to the stock loop.
+        run = getattr(uvloop, 'run', None) or asyncio.run
         try:
-            asyncio.run(self._run_async())
+            run(self._run_async())
         except KeyboardInterrupt:
             print(f"\n\n{Colors.YELLOW}Test interrupted by user.{Colors.RESET}")
             self.running = False
-            if self.statistics.start_time is None:
-                self.statistics.start_time = time.time()
             if self.statistics.end_time is None:
-                self.statistics.end_time = time.time()
+                self.statistics.mark_end()
 
     def print_final_report(self):
         """Print final test report."""
@@ -1171,7 +1379,7 @@ class LoadTester:
             print("No data collected.")
             return
 
-        elapsed = max(self.statistics.end_time - self.statistics.start_time, 1e-6)
+        elapsed = self.statistics.elapsed()
         cancelled = max(self.submitted - stats['total'], 0)
 
         print(f"\n{Colors.BOLD}Test Summary{Colors.RESET}")
@@ -1205,7 +1413,7 @@ class LoadTester:
         stats = self.statistics.get_statistics()
         if not stats:
             return
-        elapsed = max(self.statistics.end_time - self.statistics.start_time, 1e-6)
+        elapsed = self.statistics.elapsed()
 
         safe_config = {
             k: v for k, v in self.config.items()
@@ -1306,6 +1514,13 @@ class LoadTester:
 
 PATTERN_MAP = {'constant': 'Constant', 'ramp-up': 'Ramp-up', 'spike': 'Spike'}
 VALIDATION_MAP = {'none': 'No', 'status': 'Check status code', 'content': 'Validate response content'}
+# (CLI attribute, stats key, description, unit) for each --fail-on-* threshold.
+THRESHOLD_CHECKS = (
+    ('fail_on_error_rate', 'error_rate', 'error rate', '%'),
+    ('fail_on_p95', 'p95_latency', 'p95 latency', 'ms'),
+    ('fail_on_p99', 'p99_latency', 'p99 latency', 'ms'),
+    ('fail_on_avg_latency', 'avg_latency', 'average latency', 'ms'),
+)
 
 
 def build_arg_parser():
@@ -1399,7 +1614,7 @@ def build_cli_config(args):
     config['method'] = (args.method or config.get('method') or 'GET').upper()
     config['threads'] = args.threads or config.get('threads', 50)
     config['engine'] = args.engine or config.get('engine', 'threads')
-    if config['engine'] == 'async' and aiohttp is None:
+    if config['engine'] == 'async' and not _load_async_engine():
         raise ValueError("--engine async requires the 'aiohttp' package. Install it with: pip install aiohttp")
     config['duration'] = args.duration or config.get('duration', 60)
     config['pattern'] = PATTERN_MAP.get(args.pattern, config.get('pattern', 'Constant'))
@@ -1458,14 +1673,10 @@ def build_cli_config(args):
 def evaluate_thresholds(stats, args):
     """Check final stats against --fail-on-* CLI thresholds. Returns a list of failure descriptions."""
     failures = []
-    if args.fail_on_error_rate is not None and stats['error_rate'] > args.fail_on_error_rate:
-        failures.append(f"error rate {stats['error_rate']:.2f}% > {args.fail_on_error_rate}%")
-    if args.fail_on_p95 is not None and stats['p95_latency'] > args.fail_on_p95:
-        failures.append(f"p95 latency {stats['p95_latency']:.2f}ms > {args.fail_on_p95}ms")
-    if args.fail_on_p99 is not None and stats['p99_latency'] > args.fail_on_p99:
-        failures.append(f"p99 latency {stats['p99_latency']:.2f}ms > {args.fail_on_p99}ms")
-    if args.fail_on_avg_latency is not None and stats['avg_latency'] > args.fail_on_avg_latency:
-        failures.append(f"average latency {stats['avg_latency']:.2f}ms > {args.fail_on_avg_latency}ms")
+    for attr, key, description, unit in THRESHOLD_CHECKS:
+        limit = getattr(args, attr)
+        if limit is not None and stats[key] > limit:
+            failures.append(f"{description} {stats[key]:.2f}{unit} > {limit}{unit}")
     return failures
 
 
@@ -1499,11 +1710,7 @@ def run_cli(tester, args):
     tester.print_final_report()
 
     stats = tester.statistics.get_statistics()
-    thresholds_specified = any(
-        v is not None for v in (
-            args.fail_on_error_rate, args.fail_on_p95, args.fail_on_p99, args.fail_on_avg_latency
-        )
-    )
+    thresholds_specified = any(getattr(args, check[0]) is not None for check in THRESHOLD_CHECKS)
     failures = evaluate_thresholds(stats, args) if stats and thresholds_specified else None
 
     if args.output: